@@ -7,34 +7,127 @@ Migrates Spotify playlists to Tidal using ISRC codes
 import csv
 import os
 import sys
+import time
 import webbrowser
 import re
 import unicodedata
-from typing import List, Dict, Set, Tuple
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Dict, NamedTuple, Optional, Set, Tuple
 import tidalapi
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # optional - fall back to pandas' own CSV reader
+    pa = pa_csv = None
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional - fall back to the built-in word overlap matcher
+    fuzz = process = None
+
+
+# Concurrent Tidal searches per playlist, and track ids sent per playlist.add() call
+SEARCH_WORKERS = 20
+ADD_BATCH_SIZE = 100
+
+# Results requested from the single combined track + album search per track
+COMBINED_SEARCH_LIMIT = 25
+
+# Fraction of the wanted name's character bigrams a candidate must share before it is fuzzy scored
+BIGRAM_MIN_OVERLAP = 0.4
+
+# Minimum RapidFuzz token_sort_ratio (0-100) for two track names to count as a match
+FUZZY_SCORE_CUTOFF = 80
+
+
+class SpotifyTrack(NamedTuple):
+    """One row of playlist_tracks.csv, as used by the migration"""
+    playlist_name: Optional[str]
+    track_name: Optional[str]
+    artist_names: Optional[str]
+    isrc: Optional[str]
+    album_name: Optional[str]
+
+
+# Per-run search results keyed by ISRC (or name + artist), shared across playlists
+_track_cache: Dict[tuple, Optional[tidalapi.Track]] = {}
+
+# Whether reading .isrc on a search result triggers its own HTTP request (None until probed)
+_isrc_lazy: Optional[bool] = None
+ISRC_LAZY_SECONDS = 0.05
+
+# Patterns used by the text normalization helpers, compiled once at import
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_STRIP_RE = re.compile(r'\b(?:feat|featuring|ft)\.?\s|\b(?:remix|remaster|remastered)\b')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# ASCII-only equivalents: case-insensitive stripping before lowercasing, and translate tables
+# that lowercase letters and delete everything _PUNCT_RE would remove
+_STRIP_ASCII_RE = re.compile(_STRIP_RE.pattern, re.IGNORECASE)
+_ASCII_LOWER = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+_ASCII_PUNCT = bytes(code for code in range(128) if _PUNCT_RE.match(chr(code)))
+
+# Artist separators in priority order: the first one present (case-insensitively) is split on
+_ARTIST_SEPARATORS = (', ', ' & ', ' and ', ' feat. ', ' feat ', ' featuring ', ' ft. ', ' ft ')
+
+# One comma-separated playlist selection: a number or a range ("3", "2-5")
+_SELECTION_RE = re.compile(r'\s*(\d+)\s*(?:-\s*(\d+))?\s*')
+
+# Accented Latin letters -> ASCII base letter (e.g. 'Č' -> 'C'), built from their NFD forms
+_ACCENT_TABLE = {
+    code: base
+    for code, base in (
+        (code, unicodedata.normalize('NFD', chr(code))[0]) for code in range(0xC0, 0x250)
+    )
+    if base.isascii() and base != chr(code)
+}
+
+
+def _strip_accents(text: str) -> str:
+    """Remove combining marks (accents), skipping the work entirely for pure ASCII text"""
+    if text.isascii():
+        return text
+    
+    # Common accented Latin letters map directly; only decompose what's left
+    text = text.translate(_ACCENT_TABLE)
+    if text.isascii():
+        return text
+    
+    text = unicodedata.normalize('NFD', text)
+    return ''.join(char for char in text if unicodedata.category(char) != 'Mn')
+
+
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """Normalize text for fuzzy matching - lowercase, remove punctuation, handle common variations"""
     if not text:
         return ""
     
     # Normalize unicode characters (e.g., KUČKA -> KUCKA)
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(char for char in text if unicodedata.category(char) != 'Mn')
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove content in parentheses
-    text = re.sub(r'\([^)]*\)', '', text)
+    text = _strip_accents(text)
+    
+    if text.isascii():
+        # Remove parentheses content first (the word boundaries below depend on it), then
+        # featuring variations and remix/remaster in one pass; then lowercase and drop
+        # punctuation together in a single bytes.translate
+        text = _PAREN_RE.sub('', text)
+        text = _STRIP_ASCII_RE.sub('', text)
+        text = text.encode('ascii').translate(_ASCII_LOWER, _ASCII_PUNCT).decode('ascii')
+    else:
+        # Convert to lowercase
+        text = text.lower()
+        
+        # Remove parentheses content first, then featuring variations and remix/remaster in one pass
+        text = _PAREN_RE.sub('', text)
+        text = _STRIP_RE.sub('', text)
+        
+        text = _PUNCT_RE.sub('', text)  # Remove punctuation
     
-    # Handle common variations
-    text = re.sub(r'\b(feat|featuring|ft)\.?\s', '', text)  # Remove featuring variations
-    text = re.sub(r'\b(remix|remaster|remastered)\b', '', text)  # Remove remix/remaster
-    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
-    text = re.sub(r'\s+', ' ', text).strip()  # Normalize spaces
+    text = ' '.join(text.split())  # Normalize spaces (one C-level pass, trims the ends too)
     
     return text
 
@@ -45,11 +138,10 @@ def clean_track_name(track_name: str) -> str:
         return ""
     
     # Remove content in parentheses
-    cleaned = re.sub(r'\([^)]*\)', '', track_name)
+    cleaned = _PAREN_RE.sub('', track_name)
     
     # Normalize unicode
-    cleaned = unicodedata.normalize('NFD', cleaned)
-    cleaned = ''.join(char for char in cleaned if unicodedata.category(char) != 'Mn')
+    cleaned = _strip_accents(cleaned)
     
     return cleaned.strip()
 
@@ -60,115 +152,217 @@ def get_primary_artist(artist_string: str) -> str:
         return ""
     
     # Split by common separators and take the first artist
-    separators = [', ', ' & ', ' and ', ' feat. ', ' feat ', ' featuring ', ' ft. ', ' ft ']
-    
-    primary_artist = artist_string
-    for separator in separators:
-        if separator in primary_artist.lower():
-            primary_artist = primary_artist.split(separator)[0]
-            break
+    lowered = artist_string.lower()
+    for separator in _ARTIST_SEPARATORS:
+        if separator in lowered:
+            return artist_string.split(separator)[0].strip()
     
-    return primary_artist.strip()
+    return artist_string.strip()
 
 
-def fuzzy_match_words(text1: str, text2: str, threshold: float = 0.7) -> bool:
-    """Check if two texts match based on word overlap percentage"""
-    words1 = set(normalize_text(text1).split())
-    words2 = set(normalize_text(text2).split())
+@lru_cache(maxsize=8192)
+def _token_set(text: str) -> FrozenSet[str]:
+    """Normalized word set of a text (cached, so repeated comparisons are cheap)"""
+    return frozenset(normalize_text(text).split())
+
+
+def _score(words1: FrozenSet[str], words2: FrozenSet[str], threshold: float = 0.7) -> bool:
+    """Check if two word sets (from _token_set) match
     
+    Uses RapidFuzz's token_sort_ratio when it is installed, against FUZZY_SCORE_CUTOFF or
+    `threshold` as a percentage, whichever is stricter; otherwise `threshold` is the
+    required fraction of shared words.
+    """
     if not words1 or not words2:
         return False
     
+    # Identical word sets match under either scorer
+    if words1 == words2:
+        return True
+    
+    if fuzz is not None:
+        # token_sort_ratio sorts the words itself, so the set order here doesn't matter.
+        # (token_set_ratio would score a subset title like "Love" vs "Love Story" as 100.)
+        score = fuzz.token_sort_ratio(' '.join(words1), ' '.join(words2))
+        return score >= max(FUZZY_SCORE_CUTOFF, threshold * 100)
+    
+    # Cheap reject: the overlap can't exceed the shorter text's word count
+    min_words, max_words = sorted((len(words1), len(words2)))
+    if min_words / max_words < threshold:
+        return False
+    
     # Find intersection of words
     common_words = words1.intersection(words2)
     
     # Calculate match percentage based on the longer text
-    max_words = max(len(words1), len(words2))
     match_percentage = len(common_words) / max_words
     
     return match_percentage >= threshold
 
 
-def search_track_in_album(session: tidalapi.Session, track: Dict, cleaned_track_name: str) -> tidalapi.Track:
-    """Search for track within its album using cleaned track name"""
-    if not track['album_name']:
+@lru_cache(maxsize=8192)
+def _bigrams(text: str) -> FrozenSet[str]:
+    """Character bigrams of the normalized text, padded so word edges count too"""
+    padded = f" {normalize_text(text)} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+def _bigram_prefilter(needle_bigrams: FrozenSet[str], text: str) -> bool:
+    """Cheap check that `text` shares enough bigrams with the needle to be worth scoring"""
+    shared = len(needle_bigrams & _bigrams(text))
+    return shared / max(1, len(needle_bigrams)) >= BIGRAM_MIN_OVERLAP
+
+
+def fuzzy_match_words(text1: str, text2: str, threshold: float = 0.7) -> bool:
+    """Check if two texts match based on word overlap percentage"""
+    return _score(_token_set(text1), _token_set(text2), threshold)
+
+
+def _match_in_albums(albums: List[tidalapi.Album], cleaned_track_name: str) -> tidalapi.Track:
+    """Fuzzy match the cleaned track name against the tracks of each album, in order"""
+    # Normalize the wanted name once for all album tracks compared below
+    needle = _token_set(cleaned_track_name)
+    needle_bigrams = _bigrams(cleaned_track_name)
+    
+    for album in albums:
+        try:
+            album_tracks = album.tracks()
+            if process is not None:
+                # Score every track on the album in a single RapidFuzz call
+                best = process.extractOne(
+                    cleaned_track_name,
+                    [album_track.name for album_track in album_tracks],
+                    scorer=fuzz.token_sort_ratio,
+                    processor=normalize_text,
+                    score_cutoff=FUZZY_SCORE_CUTOFF,
+                )
+                if best:
+                    return album_tracks[best[2]]
+                continue
+            for album_track in album_tracks:
+                # Try fuzzy matching on cleaned track names, for names that pass the bigram prefilter
+                if not _bigram_prefilter(needle_bigrams, album_track.name):
+                    continue
+                if _score(needle, _token_set(album_track.name)):
+                    return album_track
+        except:
+            continue
+    
+    return None
+
+
+def search_track_in_album(session: tidalapi.Session, track: SpotifyTrack, cleaned_track_name: str,
+                          albums: List[tidalapi.Album] = None) -> tidalapi.Track:
+    """Search for track within its album using cleaned track name
+    
+    `albums` are results of an earlier search; any named like the track's album are checked
+    before searching Tidal for the album.
+    """
+    if not track.album_name:
         return None
     
     try:
+        # Albums we already have that look like the right one
+        known_albums = [album for album in (albums or []) if fuzzy_match_words(album.name, track.album_name)][:3]
+        album_match = _match_in_albums(known_albums, cleaned_track_name)
+        if album_match:
+            return album_match
+        
         # Search for the album
-        album_query = f"{track['album_name']} {track['artist_names']}"
+        album_query = f"{track.album_name} {track.artist_names}"
         album_results = session.search(album_query, models=[tidalapi.Album])
         
-        if album_results['albums']:
-            # Check tracks in the first few albums
-            for album in album_results['albums'][:3]:
-                try:
-                    album_tracks = album.tracks()
-                    for album_track in album_tracks:
-                        # Try fuzzy matching on cleaned track names
-                        if fuzzy_match_words(album_track.name, cleaned_track_name):
-                            return album_track
-                except:
-                    continue
+        # Check tracks in the first few albums
+        checked_ids = {album.id for album in known_albums}
+        new_albums = [album for album in album_results['albums'][:3] if album.id not in checked_ids]
+        return _match_in_albums(new_albums, cleaned_track_name)
     except:
         pass
     
     return None
 
 
-def find_best_track_match(session: tidalapi.Session, track: Dict) -> tidalapi.Track:
-    """Find the best matching track using improved 6-step strategy"""
+def _read_isrc(result_track: tidalapi.Track) -> Optional[str]:
+    """Read a search result's ISRC; the first read is timed to detect lazy per-track fetching"""
+    global _isrc_lazy
+    if _isrc_lazy is not None:
+        return result_track.isrc
     
-    # Step 1: Search by original track name and artist
-    search_query = f"{track['track_name']} {track['artist_names']}"
-    search_results = session.search(search_query, models=[tidalapi.Track])
+    started = time.perf_counter()
+    isrc = result_track.isrc
+    _isrc_lazy = time.perf_counter() - started > ISRC_LAZY_SECONDS
+    return isrc
+
+
+def find_best_track_match(session: tidalapi.Session, track: SpotifyTrack) -> tidalapi.Track:
+    """Find the best matching track, searching Tidal at most once per unique song per run"""
+    if track.isrc:
+        key = ('i', track.isrc)
+    else:
+        key = ('n', str(track.track_name).lower(), str(track.artist_names).lower())
     
-    if search_results['tracks']:
-        # Step 1: ISRC matching if available
-        for result_track in search_results['tracks'][:5]:
+    # Negative results (None) are cached too, so known-missing songs aren't searched again
+    if key in _track_cache:
+        return _track_cache[key]
+    
+    found_track = _search_best_track_match(session, track)
+    _track_cache[key] = found_track
+    return found_track
+
+
+def _search_best_track_match(session: tidalapi.Session, track: SpotifyTrack) -> tidalapi.Track:
+    """Find the best matching track using improved 5-step strategy"""
+    
+    # Direct ISRC lookup: a single keyed request that usually makes the text search unnecessary
+    if track.isrc:
+        try:
+            isrc_hits = session.get_tracks_by_isrc(track.isrc)
+            if isrc_hits:
+                return isrc_hits[0]
+        except Exception:
+            pass  # lookup unsupported by this tidalapi version, or no match - fall back to search
+    
+    cleaned_track_name = clean_track_name(track.track_name)
+    primary_artist = get_primary_artist(track.artist_names)
+    
+    # One combined track + album search; every text-based step below scores its results locally
+    search_query = f"{cleaned_track_name} {primary_artist}"
+    search_results = session.search(search_query, models=[tidalapi.Track, tidalapi.Album], limit=COMBINED_SEARCH_LIMIT)
+    candidates = search_results['tracks'] or []
+    
+    # Step 1: ISRC matching if available (skipped when reading .isrc costs a request per track)
+    if track.isrc:
+        for result_track in candidates[:5]:
+            if _isrc_lazy:
+                break
             try:
-                if hasattr(result_track, 'isrc') and result_track.isrc == track['isrc']:
+                if _read_isrc(result_track) == track.isrc:
                     return result_track
             except:
                 pass
-        
-        # Step 2: Exact name matching
-        for result_track in search_results['tracks'][:5]:
-            if result_track.name.lower().strip() == track['track_name'].lower().strip():
-                return result_track
-    
-    # Step 3: Clean track name and search with modified name
-    cleaned_track_name = clean_track_name(track['track_name'])
-    if cleaned_track_name != track['track_name']:
-        # Search again with cleaned name
-        search_query = f"{cleaned_track_name} {track['artist_names']}"
-        search_results = session.search(search_query, models=[tidalapi.Track])
-    
-    if search_results['tracks']:
-        # Step 3: Fuzzy word match on search results (with cleaned names)
-        for result_track in search_results['tracks'][:5]:
-            if fuzzy_match_words(result_track.name, cleaned_track_name):
-                return result_track
-    
-    # Step 4: Artist name simplification
-    primary_artist = get_primary_artist(track['artist_names'])
-    if primary_artist != track['artist_names']:
-        # Search with primary artist only
-        search_query = f"{cleaned_track_name} {primary_artist}"
-        simplified_results = session.search(search_query, models=[tidalapi.Track])
-        
-        if simplified_results['tracks']:
-            # Try fuzzy matching with simplified search
-            for result_track in simplified_results['tracks'][:5]:
-                if fuzzy_match_words(result_track.name, cleaned_track_name):
-                    return result_track
     
-    # Step 5: Album search + fuzzy match with cleaned names
-    album_match = search_track_in_album(session, track, cleaned_track_name)
+    # Step 2: Exact name matching
+    wanted_name = track.track_name.lower().strip()
+    for result_track in candidates[:5]:
+        if result_track.name.lower().strip() == wanted_name:
+            return result_track
+    
+    # Step 3: Fuzzy word match on search results (with cleaned names)
+    # The cleaned name is compared against every candidate; normalize it once
+    needle = _token_set(cleaned_track_name)
+    needle_bigrams = _bigrams(cleaned_track_name)
+    for result_track in candidates[:5]:
+        if not _bigram_prefilter(needle_bigrams, result_track.name):
+            continue  # too little in common to be worth a full fuzzy score
+        if _score(needle, _token_set(result_track.name)):
+            return result_track
+    
+    # Step 4: Album search + fuzzy match with cleaned names (reusing the albums found above)
+    album_match = search_track_in_album(session, track, cleaned_track_name, search_results['albums'])
     if album_match:
         return album_match
     
-    # Step 6: Mark as not found
+    # Step 5: Mark as not found
     return None
 
 
@@ -230,19 +424,70 @@ def authenticate_tidal():
         sys.exit(1)
 
 
-def load_spotify_data(filename: str = "spotify csvs/playlist_tracks.csv") -> pd.DataFrame:
-    """Load Spotify playlist data from CSV"""
+# Columns of playlist_tracks.csv used by the migration
+SPOTIFY_COLUMNS = ['playlist_id', 'playlist_name', 'track_name', 'artist_names', 'isrc', 'album_name']
+SPOTIFY_DATA_FILE = "spotify csvs/playlist_tracks.csv"
+
+# Chunk sizes for streaming the CSV (rows for pandas, bytes per record batch for pyarrow)
+CSV_CHUNK_ROWS = 50_000
+CSV_BLOCK_BYTES = 8 << 20
+
+
+def iter_spotify_chunks(filename: str, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """Read the Spotify CSV as a sequence of DataFrame chunks holding only `columns`"""
+    if pa_csv is None:
+        # pyarrow isn't installed - use pandas' default parser
+        yield from pd.read_csv(filename, usecols=columns, dtype=str, chunksize=CSV_CHUNK_ROWS)
+        return
+    
+    # Arrow's streaming reader parses just the columns we use, one record batch at a time
+    reader = pa_csv.open_csv(
+        filename,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: pa.string() for column in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def load_playlist_index(filename: str = SPOTIFY_DATA_FILE) -> pd.DataFrame:
+    """Load the unique (playlist_id, playlist_name) pairs from the Spotify CSV"""
     if not os.path.exists(filename):
         print(f"Error: {filename} not found in current directory.")
         print("Please ensure your Spotify data file is named 'playlist_tracks.csv' and located in directory 'spotify csvs'")
         sys.exit(1)
     
     try:
-        df = pd.read_csv(filename)
-        return df
+        chunks = [
+            chunk.drop_duplicates()
+            for chunk in iter_spotify_chunks(filename, ['playlist_id', 'playlist_name'])
+        ]
+        if not chunks:
+            return pd.DataFrame(columns=['playlist_id', 'playlist_name'])
+        return pd.concat(chunks, ignore_index=True).drop_duplicates()
+    except Exception as e:
+        print(f"Error reading {filename}: {str(e)}")
+        sys.exit(1)
+
+
+def load_playlist_tracks(playlist_ids: Set[str], filename: str = SPOTIFY_DATA_FILE) -> Dict[str, List[SpotifyTrack]]:
+    """Load the tracks of the given playlists only, streaming through the Spotify CSV"""
+    tracks_by_playlist = defaultdict(list)
+    
+    try:
+        for chunk in iter_spotify_chunks(filename, SPOTIFY_COLUMNS):
+            chunk = chunk[chunk['playlist_id'].isin(playlist_ids)]
+            for playlist_id, tracks in group_playlist_tracks(chunk).items():
+                tracks_by_playlist[playlist_id].extend(tracks)
     except Exception as e:
         print(f"Error reading {filename}: {str(e)}")
         sys.exit(1)
+    
+    return tracks_by_playlist
 
 
 def get_unique_playlists(df: pd.DataFrame) -> List[Tuple[str, str]]:
@@ -252,7 +497,7 @@ def get_unique_playlists(df: pd.DataFrame) -> List[Tuple[str, str]]:
     # Sort by playlist name for consistent ordering
     unique_playlists = unique_playlists.sort_values('playlist_name')
     
-    return [(row['playlist_id'], row['playlist_name']) for _, row in unique_playlists.iterrows()]
+    return list(unique_playlists.itertuples(index=False, name=None))
 
 
 def display_playlists(playlists: List[Tuple[str, str]]) -> None:
@@ -267,80 +512,100 @@ def parse_playlist_selection(user_input: str, max_num: int) -> Set[int]:
     """Parse user's playlist selection input"""
     selected = set()
     
-    # Clean input - remove spaces and split by comma
-    parts = [part.strip() for part in user_input.split(',')]
-    
-    for part in parts:
-        if '-' in part:
-            # Handle range like "2-5"
-            try:
-                start, end = part.split('-')
-                start, end = int(start.strip()), int(end.strip())
-                if 1 <= start <= max_num and 1 <= end <= max_num and start <= end:
-                    selected.update(range(start, end + 1))
-                else:
-                    print(f"Warning: Invalid range {part}, skipping")
-            except ValueError:
-                print(f"Warning: Invalid range format {part}, skipping")
+    for part in user_input.split(','):
+        # Numbers like "3" and ranges like "2-5"; anything else in a part rejects the whole part
+        match = _SELECTION_RE.fullmatch(part)
+        if not match:
+            kind = "range format" if '-' in part else "number"
+            print(f"Warning: Invalid {kind} {part.strip()}, skipping")
+            continue
+        
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        
+        if 1 <= start <= end <= max_num:
+            selected.update(range(start, end + 1))
+        elif match.group(2):
+            print(f"Warning: Invalid range {part.strip()}, skipping")
         else:
-            # Handle single number
-            try:
-                num = int(part.strip())
-                if 1 <= num <= max_num:
-                    selected.add(num)
-                else:
-                    print(f"Warning: Number {num} out of range, skipping")
-            except ValueError:
-                print(f"Warning: Invalid number {part}, skipping")
+            print(f"Warning: Number {start} out of range, skipping")
     
     return selected
 
 
-def get_playlist_tracks(df: pd.DataFrame, playlist_id: str) -> List[Dict]:
-    """Get all tracks for a specific playlist"""
-    playlist_tracks = df[df['playlist_id'] == playlist_id].copy()
+def group_playlist_tracks(df: pd.DataFrame) -> Dict[str, List[SpotifyTrack]]:
+    """Group all tracks by playlist id, as SpotifyTrack records"""
+    # Blank cells (NaN / NA) become None so they can be checked with a plain truth test
+    df = df.astype(object).where(df.notna(), None)
     
-    # Convert to list of dictionaries for easier processing
-    tracks = []
-    for _, row in playlist_tracks.iterrows():
-        tracks.append({
-            'playlist_name': row['playlist_name'],
-            'track_name': row['track_name'],
-            'artist_names': row['artist_names'],
-            'isrc': row['isrc'] if pd.notna(row['isrc']) else None,
-            'album_name': row['album_name']
-        })
+    tracks_by_playlist = {}
+    for playlist_id, playlist_tracks in df.groupby('playlist_id', sort=False):
+        rows = playlist_tracks[list(SpotifyTrack._fields)].itertuples(index=False, name=None)
+        
+        # Every track of a playlist shares one interned copy of the playlist name
+        tracks_by_playlist[playlist_id] = [
+            SpotifyTrack(sys.intern(name) if isinstance(name, str) else name, *rest)
+            for name, *rest in rows
+        ]
     
-    return tracks
+    return tracks_by_playlist
 
 
-def write_not_found_track(track: Dict, reason: str, filename: str = "not_found.csv"):
-    """Append a not-found track to the CSV file"""
-    file_exists = os.path.exists(filename)
+class NotFoundLogger:
+    """Buffers not-found tracks and appends them to a CSV file, one batch per flush"""
     
-    with open(filename, 'a', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['playlist_name', 'track_name', 'artist_names', 'album_name', 'isrc', 'reason']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        # Write header if file is new
-        if not file_exists:
-            writer.writeheader()
-        
-        writer.writerow({
-            'playlist_name': track['playlist_name'],
-            'track_name': track['track_name'],
-            'artist_names': track['artist_names'],
-            'album_name': track['album_name'],
-            'isrc': track['isrc'] if track['isrc'] else '',
+    fieldnames = ['playlist_name', 'track_name', 'artist_names', 'album_name', 'isrc', 'reason']
+    
+    def __init__(self, filename: str = "not_found.csv"):
+        self.filename = filename
+        self._file = None
+        self._writer = None
+        self._pending = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def write(self, track: SpotifyTrack, reason: str):
+        """Queue a not-found track; it is written on the next flush()"""
+        self._pending.append({
+            'playlist_name': track.playlist_name,
+            'track_name': track.track_name,
+            'artist_names': track.artist_names,
+            'album_name': track.album_name,
+            'isrc': track.isrc if track.isrc else '',
             'reason': reason
         })
+    
+    def flush(self):
+        """Write all queued rows, opening the file (and writing the header) on first use"""
+        if not self._pending:
+            return
+        
+        if self._file is None:
+            file_exists = os.path.exists(self.filename)
+            self._file = open(self.filename, 'a', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            
+            # Write header if file is new
+            if not file_exists:
+                self._writer.writeheader()
+        
+        self._writer.writerows(self._pending)
+        self._pending.clear()
+        self._file.flush()
+    
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
-def get_unique_playlist_name(user, desired_name: str) -> str:
+def get_unique_playlist_name(desired_name: str, existing_names: Set[str]) -> str:
     """Get a unique playlist name, adding version numbers if needed"""
-    existing_playlists = user.playlists()
-    existing_names = {pl.name for pl in existing_playlists}
-    
     # If the desired name doesn't exist, use it as-is
     if desired_name not in existing_names:
         return desired_name
@@ -354,131 +619,130 @@ def get_unique_playlist_name(user, desired_name: str) -> str:
         version += 1
 
 
-def create_tidal_playlist(session: tidalapi.Session, playlist_name: str, tracks: List[Dict]) -> List[Dict]:
-    """Create a Tidal playlist and add tracks, return list of not found tracks"""
+def _match_track(session: tidalapi.Session, track: SpotifyTrack) -> Tuple[SpotifyTrack, tidalapi.Track, Exception]:
+    """Search worker for the thread pool: returns (track, found_track, search_error)"""
+    try:
+        return track, find_best_track_match(session, track), None
+    except Exception as e:
+        return track, None, e
+
+
+def create_tidal_playlist(session: tidalapi.Session, playlist_name: str, tracks: List[SpotifyTrack],
+                          not_found_log: NotFoundLogger, existing_names: Set[str]) -> List[Dict]:
+    """Create a Tidal playlist and add tracks, return list of not found tracks
+    
+    `existing_names` holds the names of the user's Tidal playlists and is updated with the new one.
+    """
     print(f"Generating playlist '{playlist_name}'!")
     
     not_found = []
     total_tracks = len(tracks)
     processed_count = 0
     
+    def record_not_found(track: SpotifyTrack, reason: str):
+        not_found_log.write(track, reason)
+        not_found.append({
+            'name': track.track_name,
+            'artist': track.artist_names,
+            'reason': reason
+        })
+    
     try:
         user = session.user
         
         # Get a unique playlist name (add version numbers if needed)
-        unique_playlist_name = get_unique_playlist_name(user, playlist_name)
+        unique_playlist_name = get_unique_playlist_name(playlist_name, existing_names)
         
         if unique_playlist_name != playlist_name:
             print(f"Playlist '{playlist_name}' already exists. Creating '{unique_playlist_name}' instead.")
         
         # Create the new playlist with unique name
         playlist = user.create_playlist(unique_playlist_name, "Migrated from Spotify")
-        added_tracks = set()  # Track which songs we've successfully added
+        playlist_id = playlist.id  # for fetching the playlist again after re-authentication
+        existing_names.add(unique_playlist_name)
         
-        for track_index, track in enumerate(tracks):
-            processed_count += 1
-            
-            # Update progress in place (use the unique name for consistency)
-            print(f"\rGenerating playlist '{unique_playlist_name}'! ({processed_count}/{total_tracks})", end='', flush=True)
-            
-            if not track['isrc']:
+        # Pick out the tracks worth searching for; each song is only searched once
+        to_search = []
+        seen_tracks = set()
+        for track in tracks:
+            if not track.isrc:
                 # No ISRC available
-                write_not_found_track(track, "isrc blank in input")
-                not_found.append({
-                    'name': track['track_name'],
-                    'artist': track['artist_names'],
-                    'reason': "isrc blank in input"
-                })
+                processed_count += 1
+                record_not_found(track, "isrc blank in input")
                 continue
             
-            # Track identifier for resume functionality
-            track_id_key = f"{track['track_name']}|{track['artist_names']}"
-            
-            # Skip if we already added this track (for resume functionality)
-            if track_id_key in added_tracks:
+            track_id_key = f"{track.track_name}|{track.artist_names}"
+            if track_id_key in seen_tracks:
+                processed_count += 1
                 continue
-            
-            try:
-                # Use improved fuzzy matching to find track
-                found_track = find_best_track_match(session, track)
+            seen_tracks.add(track_id_key)
+            to_search.append(track)
+        
+        # Step 1: search Tidal for all tracks concurrently (results come back in playlist order)
+        found_tracks = []
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            for track, found_track, search_error in executor.map(lambda t: _match_track(session, t), to_search):
+                processed_count += 1
                 
-                if found_track:
-                    # Found track, now try to add to playlist
-                    retry_count = 0
-                    max_retries = 1
-                    
-                    while retry_count <= max_retries:
-                        try:
-                            playlist.add([found_track.id])
-                            added_tracks.add(track_id_key)  # Mark as successfully added
-                            break  # Success, exit retry loop
-                            
-                        except Exception as add_error:
-                            error_str = str(add_error)
-                            
-                            # Check if it's a 412 error
-                            if "412" in error_str and "Client Error" in error_str:
-                                print(f"\n\nRe-authentication required for track: {track['track_name']} by {track['artist_names']}")
-                                print("Would you like to authenticate again? (y/n): ", end='')
-                                
-                                user_response = input().strip().lower()
-                                
-                                if 'y' in user_response:
-                                    print("Re-authenticating...")
-                                    
-                                    # Step 1: Check and re-authenticate
-                                    if not session.check_login():
-                                        session = authenticate_tidal()
-                                    
-                                    # Update references after re-auth
-                                    user = session.user
-                                    
-                                    # Find the playlist again (it might have a new reference)
-                                    user_playlists = user.playlists()
-                                    playlist = None
-                                    for pl in user_playlists:
-                                        if pl.name == unique_playlist_name:
-                                            playlist = pl
-                                            break
-                                    
-                                    if not playlist:
-                                        raise Exception(f"Could not find playlist '{unique_playlist_name}' after re-authentication")
-                                    
-                                    retry_count += 1
-                                    print(f"Retrying track: {track['track_name']}")
-                                    continue  # Retry the add operation
-                                else:
-                                    print("Exiting program as requested.")
-                                    sys.exit(0)
-                            else:
-                                # Not a 412 error, treat as regular error
-                                raise add_error
-                    
-                    # If we exhausted retries without success
-                    if track_id_key not in added_tracks:
-                        write_not_found_track(track, f"error after retries: {str(add_error)}")
-                        not_found.append({
-                            'name': track['track_name'],
-                            'artist': track['artist_names'],
-                            'reason': f"error after retries: {str(add_error)}"
-                        })
+                # Update progress in place (use the unique name for consistency)
+                print(f"\rGenerating playlist '{unique_playlist_name}'! ({processed_count}/{total_tracks})", end='', flush=True)
+                
+                if search_error is not None:
+                    # Error searching track (not adding to playlist)
+                    record_not_found(track, f"search error: {str(search_error)}")
+                elif found_track:
+                    found_tracks.append((track, found_track))
                 else:
                     # Track not found on Tidal
-                    write_not_found_track(track, "track not found on Tidal")
-                    not_found.append({
-                        'name': track['track_name'],
-                        'artist': track['artist_names'],
-                        'reason': "track not found on Tidal"
-                    })
+                    record_not_found(track, "track not found on Tidal")
+        
+        # Step 2: add the found tracks to the playlist in batches
+        for batch_start in range(0, len(found_tracks), ADD_BATCH_SIZE):
+            batch = found_tracks[batch_start:batch_start + ADD_BATCH_SIZE]
+            retry_count = 0
+            max_retries = 1
+            
+            while True:
+                try:
+                    playlist.add([found_track.id for _, found_track in batch])
+                    break  # Success, exit retry loop
+                    
+                except Exception as add_error:
+                    error_str = str(add_error)
+                    
+                    # Anything but a 412 error, or a 412 that survived re-authentication, fails the batch
+                    if not ("412" in error_str and "Client Error" in error_str):
+                        for track, _ in batch:
+                            record_not_found(track, f"add error: {error_str}")
+                        break
+                    if retry_count >= max_retries:
+                        for track, _ in batch:
+                            record_not_found(track, f"error after retries: {error_str}")
+                        break
+                    
+                    print(f"\n\nRe-authentication required while adding tracks to '{unique_playlist_name}'")
+                    print("Would you like to authenticate again? (y/n): ", end='')
+                    
+                    user_response = input().strip().lower()
+                    
+                    if 'y' not in user_response:
+                        print("Exiting program as requested.")
+                        sys.exit(0)
+                    
+                    print("Re-authenticating...")
                     
-            except Exception as e:
-                # Error searching track (not adding to playlist)
-                write_not_found_track(track, f"search error: {str(e)}")
-                not_found.append({
-                    'name': track['track_name'],
-                    'artist': track['artist_names'],
-                    'reason': f"search error: {str(e)}"
-                })
+                    # Step 1: Check and re-authenticate
+                    if not session.check_login():
+                        session = authenticate_tidal()
+                    
+                    # Fetch the playlist again by id (it might have a new reference)
+                    try:
+                        playlist = session.playlist(playlist_id)
+                    except Exception:
+                        raise Exception(f"Could not find playlist '{unique_playlist_name}' after re-authentication")
+                    
+                    retry_count += 1
+                    print(f"Retrying {len(batch)} tracks")
         
         # Clear the progress line and move to next line
         print()
@@ -486,8 +750,16 @@ def create_tidal_playlist(session: tidalapi.Session, playlist_name: str, tracks:
         return not_found
         
     except Exception as e:
-        print(f"\nError creating playlist '{unique_playlist_name}': {str(e)}")
-        return tracks  # Return all tracks as not found
+        print(f"\nError creating playlist '{playlist_name}': {str(e)}")
+        # Return all tracks as not found
+        return [
+            {'name': track.track_name, 'artist': track.artist_names, 'reason': f"playlist error: {str(e)}"}
+            for track in tracks
+        ]
+    
+    finally:
+        # One write per playlist for everything that couldn't be migrated
+        not_found_log.flush()
 
 
 def display_not_found_songs(not_found: List[Dict], playlist_name: str):
@@ -507,16 +779,17 @@ def display_not_found_songs(not_found: List[Dict], playlist_name: str):
 def main():
     """Main function"""
     welcome_message()
+    _track_cache.clear()
     
     # Authenticate with Tidal
     session = authenticate_tidal()
     print()
     
-    # Load Spotify data
-    df = load_spotify_data()
+    # Fetch the user's existing playlist names once, for picking unique names
+    existing_names = {pl.name for pl in session.user.playlists()}
     
-    # Get unique playlists
-    playlists = get_unique_playlists(df)
+    # Load Spotify data (just the playlist names for now)
+    playlists = get_unique_playlists(load_playlist_index())
     
     if not playlists:
         print("No playlists found in the data file.")
@@ -546,15 +819,19 @@ def main():
     # Process selected playlists
     selected_playlists = [playlists[i-1] for i in sorted(selected_indices)]
     
-    for playlist_id, playlist_name in selected_playlists:
-        # Get tracks for this playlist
-        tracks = get_playlist_tracks(df, playlist_id)
-        
-        # Create playlist on Tidal
-        not_found = create_tidal_playlist(session, playlist_name, tracks)
-        
-        # Display results
-        display_not_found_songs(not_found, playlist_name)
+    # Second pass over the data: only the selected playlists' tracks are kept in memory
+    tracks_by_playlist = load_playlist_tracks({playlist_id for playlist_id, _ in selected_playlists})
+    
+    with NotFoundLogger() as not_found_log:
+        for playlist_id, playlist_name in selected_playlists:
+            # Get tracks for this playlist
+            tracks = tracks_by_playlist.get(playlist_id, [])
+            
+            # Create playlist on Tidal
+            not_found = create_tidal_playlist(session, playlist_name, tracks, not_found_log, existing_names)
+            
+            # Display results
+            display_not_found_songs(not_found, playlist_name)
     
     print("Playlist migration complete!")
     if os.path.exists("not_found.csv"):
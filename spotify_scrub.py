@@ -22,11 +22,31 @@ Spotify Library Export (full):
 Auth: PKCE (no client secret), redirect to http://127.0.0.1:8888/callback/
 """
 
-import os, sys
-from typing import Dict, Any, Iterable, List, Optional
+import csv, gzip, json, os, sys, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable
 import pandas as pd
+import requests
 import spotipy
+from requests.adapters import HTTPAdapter
 from spotipy.oauth2 import SpotifyOAuth
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:  # optional - the standard json module is used instead
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional - only needed for EXPORT_COMPRESS=zstd
+    zstandard = None
+
+try:
+    import pyarrow
+except ImportError:  # optional - only needed for EXPORT_PARQUET=1 (used through pandas)
+    pyarrow = None
 
 # ========= CONFIG =========
 set_client_id = input("Please paste your CLIENT_ID and press 'enter' : ").strip()
@@ -62,6 +82,30 @@ OUT = {
 }
 
 
+# Set EXPORT_PARQUET=1 to also write zstd-compressed Parquet files (requires pyarrow)
+EXPORT_PARQUET = os.environ.get("EXPORT_PARQUET") == "1"
+
+# Set EXPORT_COMPRESS=gzip or zstd to compress the CSV/JSON Lines files (.gz / .zst; zstd requires zstandard)
+EXPORT_COMPRESS = os.environ.get("EXPORT_COMPRESS", "none").lower()
+COMPRESS_SUFFIX = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# One thread pool shared by every exporter, so pool start-up is paid once (shut down at the end of main())
+EXECUTOR_WORKERS = 10
+EXECUTOR = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS)
+
+# Playlist-track pages submitted ahead of the one being written
+PAGES_AHEAD = 2 * EXECUTOR_WORKERS
+
+# Cap on Spotify API requests in flight at once, across all exporters
+MAX_IN_FLIGHT = 10
+SEMAPHORE = threading.Semaphore(MAX_IN_FLIGHT)
+
+# Kept-alive HTTPS connections to the Spotify API (>= EXECUTOR_WORKERS)
+HTTP_POOL_SIZE = 20
+
+# Buffer size for output files (1 MiB)
+WRITE_BUFFER = 1 << 20
+
 
 # ========= AUTH =========
 def auth_client() -> spotipy.Spotify:
@@ -74,38 +118,65 @@ def auth_client() -> spotipy.Spotify:
         client_secret=set_client_secret,
         redirect_uri=REDIRECT_URI,
         scope=" ".join(SCOPES),
-        cache_path=".cache_spotify_export_full",
-        show_dialog=True,  # force account chooser
+        cache_path=".cache_spotify_export_full",  # reused across runs; delete it to switch accounts
+    )
+    # spotipy reads the cached token and refreshes it itself when it expires mid-run
+    return spotipy.Spotify(auth_manager=auth, requests_session=_http_session())
+
+def _http_session() -> requests.Session:
+    """One keep-alive session for all API calls, pooled for our concurrent page fetches."""
+    session = requests.Session()
+    # Rate limits (429) and gateway hiccups are retried, sleeping for Retry-After when Spotify sends it
+    retry = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False,
     )
-    token_info = auth.get_access_token()
-    access_token = token_info["access_token"] if isinstance(token_info, dict) else token_info
-    return spotipy.Spotify(auth=access_token)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
 
 
 
 
-def safe(obj: Optional[Dict], path: List[str], default=None):
-    cur = obj
-    for p in path:
-        if cur is None: return default
-        if isinstance(cur, dict):
-            cur = cur.get(p)
-        else:
-            return default
-    return default if cur is None else cur
+def bounded_call(method, *args, **kwargs):
+    """
+    Call a Spotify API method while holding one of the MAX_IN_FLIGHT request slots.
+    Only these leaf calls are submitted to EXECUTOR; a task never waits on another task.
+    """
+    with SEMAPHORE:
+        return method(*args, **kwargs)
 
 def paginate(method, key: str, limit: int = 50, **kwargs) -> Iterable[Dict[str, Any]]:
-    """Generic offset-based pagination (most endpoints)."""
-    offset = 0
-    while True:
-        page = method(limit=limit, offset=offset, **kwargs)
-        items = page.get(key, [])
-        for it in items:
-            yield it
-        if page.get("next"):
+    """
+    Generic offset-based pagination (most endpoints).
+    The first page reports `total`; the remaining pages are then fetched concurrently
+    on the shared EXECUTOR and yielded in offset order.
+    """
+    page = bounded_call(method, limit=limit, offset=0, **kwargs)
+    for it in page.get(key, []):
+        yield it
+    if not page.get("next"):
+        return
+
+    total = page.get("total")
+    if total is None:
+        # No total reported: follow the pages one by one
+        offset = limit
+        while True:
+            page = bounded_call(method, limit=limit, offset=offset, **kwargs)
+            for it in page.get(key, []):
+                yield it
+            if not page.get("next"):
+                return
             offset += limit
-        else:
-            break
+
+    pages = EXECUTOR.map(lambda offset: bounded_call(method, limit=limit, offset=offset, **kwargs), range(limit, total, limit))
+    for page in pages:
+        for it in page.get(key, []):
+            yield it
 
 
 
@@ -134,6 +205,23 @@ COLUMNS_ALL = [
     "episode_name","episode_id","episode_uri",
 ]
 
+# Fixed dtypes for known columns (nullable ints/bools; categories for repeated strings)
+DTYPES = {
+    "popularity": "Int16",
+    "duration_ms": "Int32",
+    "followers": "Int64",
+    "total_tracks": "Int16",
+    "tracks_total": "Int32",
+    "total_episodes": "Int32",
+    "rank": "Int16",
+    "explicit": "boolean",
+    "is_local": "boolean",
+    "public": "boolean",
+    "collaborative": "boolean",
+    "artist_names": "category",
+    "genres": "category",
+}
+
 # Per-export error counters
 ERR = {
     "liked": {"count": 0},
@@ -156,22 +244,21 @@ def safe_join_names(items, key="name"):
     Returns None if there are no valid names (CSV shows blank; JSON -> null).
     """
     try:
-        names = [d.get(key) for d in (items or []) if isinstance(d, dict) and d.get(key)]
-        return ", ".join(names) if names else None
-    except Exception as e:
+        return ", ".join(filter(None, (d.get(key) for d in (items or [])))) or None
+    except AttributeError as e:
         ERROR_LOG.append({"where": "safe_join_names", "detail": str(e)})
         return None
 
-def safe_row_append(rows, row_dict, expected_columns, ctx=None, errors_counter=None):
+def safe_row_append(cols, row_dict, ctx=None, errors_counter=None):
     """
-    Append a standardized row:
-    - Ensures all expected columns exist.
-    - Missing/None -> keep as None (CSV blank, JSON null).
-    - On exception, logs to ERROR_LOG, increments counter, and appends a blank row.
+    Append a row column-wise to `cols` (column name -> list of values):
+    - Only the row's own keys are stored; frame_from_columns() adds the rest of COLUMNS_ALL once.
+    - Each exporter builds rows with the same keys, so the column lists stay aligned.
+    - On exception, logs to ERROR_LOG and increments counter; the row is then skipped whole.
     """
     try:
-        full_row = {col: (row_dict.get(col, None) if row_dict else None) for col in expected_columns}
-        rows.append(full_row)
+        # Read the whole row first, so a failure can't leave the column lists different lengths
+        items = list(row_dict.items())
     except Exception as e:
         ERROR_LOG.append({
             "where": "safe_row_append",
@@ -180,18 +267,63 @@ def safe_row_append(rows, row_dict, expected_columns, ctx=None, errors_counter=N
         })
         if isinstance(errors_counter, dict):
             errors_counter["count"] = errors_counter.get("count", 0) + 1
-        rows.append({col: None for col in expected_columns})
+        return
+    for col, val in items:
+        cols.setdefault(col, []).append(val)
+
+def apply_dtypes(df):
+    """Cast the columns listed in DTYPES; on unexpected data the frame is kept as-is and the error logged."""
+    try:
+        return df.astype({k: v for k, v in DTYPES.items() if k in df.columns})
+    except (TypeError, ValueError) as e:
+        ERROR_LOG.append({"where": "apply_dtypes", "detail": str(e)})
+        return df
+
+def frame_from_columns(cols, expected_columns=COLUMNS_ALL):
+    """Build the DataFrame once from column lists; missing columns are filled in C by reindex."""
+    return apply_dtypes(pd.DataFrame(cols).reindex(columns=expected_columns))
+
+# OUT['liked_songs'] -> 'liked_songs' (extension stripped for paired CSV/JSON writes), computed once
+BASEPATHS = {k: (v[:-4] if v.lower().endswith(".csv") else v) for k, v in OUT.items()}
 
-def _basepath(key):
-    """Turn OUT['liked_songs'] -> 'liked_songs' (strip extension for paired CSV/JSON writes)."""
-    fn = OUT[key]
-    return fn[:-4] if fn.lower().endswith(".csv") else fn
+def _out_path(directory, filename):
+    """Output path inside `directory`, with the EXPORT_COMPRESS suffix appended."""
+    return os.path.join(directory, filename + COMPRESS_SUFFIX[EXPORT_COMPRESS])
+
+def _open_out(path, binary=False):
+    """
+    Open an output file for writing, compressed according to EXPORT_COMPRESS.
+    Uncompressed files get a large (WRITE_BUFFER) buffer to cut write syscalls.
+    """
+    mode = "wb" if binary else "wt"
+    text = {} if binary else {"newline": "", "encoding": "utf-8"}
+    if EXPORT_COMPRESS == "gzip":
+        return gzip.open(path, mode, **text)
+    if EXPORT_COMPRESS == "zstd":
+        return zstandard.open(path, mode, **text)
+    return open(path, mode, buffering=WRITE_BUFFER, **text)
+
+def _json_default(obj):
+    """orjson fallback for values it doesn't know: pandas' missing-value marker becomes null."""
+    if obj is pd.NA:
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _json_line(record) -> bytes:
+    """One compact JSON Lines record (orjson when installed, else the json module)."""
+    if orjson is not None:
+        return orjson.dumps(
+            record,
+            default=_json_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
 def save_csv_json(df, basepath, csv_missing=""):
     """
     Writes both CSV and JSON to 'spotify csvs' and 'spotify jsons' directories:
     - CSV with blanks (na_rep="") or a subtle placeholder if you set csv_missing (e.g., "-").
-    - JSON with null for missing values.
+    - JSON Lines (.jsonl, one record per line) with null for missing values.
     """
     # Ensure directories exist
     os.makedirs("spotify csvs", exist_ok=True)
@@ -201,20 +333,114 @@ def save_csv_json(df, basepath, csv_missing=""):
     filename = os.path.basename(basepath)
 
     # Save CSV in 'spotify csvs'
-    csv_path = os.path.join("spotify csvs", f"{filename}.csv")
-    df.to_csv(csv_path, index=False, na_rep=csv_missing)
-
-    # Save JSON in 'spotify jsons'
-    json_path = os.path.join("spotify jsons", f"{filename}.json")
-    df.to_json(json_path, orient="records", indent=2)
+    csv_path = _out_path("spotify csvs", f"{filename}.csv")
+    with _open_out(csv_path) as f:
+        # csv.writer over plain tuples is much cheaper than to_csv's per-cell formatting
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(df.columns)
+        writer.writerows(df.astype(object).where(df.notna(), csv_missing).itertuples(index=False, name=None))
+
+    # Save JSON Lines (one compact record per line) in 'spotify jsons'
+    json_path = _out_path("spotify jsons", f"{filename}.jsonl")
+    if orjson is not None:
+        # orjson writes NaN as null, so records can be dumped as-is without pandas' JSON writer
+        with _open_out(json_path, binary=True) as f:
+            for record in df.to_dict("records"):
+                f.write(_json_line(record))
+    else:
+        with _open_out(json_path) as f:
+            df.to_json(f, orient="records", lines=True, date_format="iso", force_ascii=False)
 
     print(f"Saved: {csv_path} and {json_path}")
 
+    # Optional Parquet copy in 'spotify parquet' (EXPORT_PARQUET=1)
+    if EXPORT_PARQUET:
+        save_parquet(df, filename)
+
+def save_parquet(df, filename):
+    """Write a zstd-compressed Parquet copy of an export to 'spotify parquet'."""
+    os.makedirs("spotify parquet", exist_ok=True)
+    parquet_path = os.path.join("spotify parquet", f"{filename}.parquet")
+    # Every column outside DTYPES is text, but reindex leaves an unused one as all-NaN float64.
+    # Write those, and the category columns, as plain strings: categories would become a
+    # dictionary type whose index width (or null, when empty) varies from file to file.
+    df = df.astype({col: "string" for col in df.columns if DTYPES.get(col, "category") == "category"})
+    df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+    print(f"Saved: {parquet_path}")
+
+class StreamingExporter:
+    """
+    Writes rows straight to the CSV and JSON Lines files as they are produced, so large
+    exports never sit in memory as a whole (same layout and directories as save_csv_json).
+    Use as a context manager; `count` is the number of rows written.
+    Rows go to "<name>.part" files that replace the previous export only when the `with`
+    block finishes without an exception; on failure they are deleted and the old files kept.
+    With EXPORT_PARQUET=1 rows are also kept, for the Parquet copy written on close.
+    """
+
+    def __init__(self, basepath, columns=COLUMNS_ALL, csv_missing=""):
+        os.makedirs("spotify csvs", exist_ok=True)
+        os.makedirs("spotify jsons", exist_ok=True)
+        self.filename = os.path.basename(basepath)
+        self.columns = columns
+        self.csv_path = _out_path("spotify csvs", f"{self.filename}.csv")
+        self.json_path = _out_path("spotify jsons", f"{self.filename}.jsonl")
+        self._csv = _open_out(self.csv_path + ".part")
+        self._json = _open_out(self.json_path + ".part", binary=True)
+        self._writer = csv.DictWriter(self._csv, fieldnames=columns, restval=csv_missing, extrasaction="ignore", lineterminator="\n")
+        self._writer.writeheader()
+        self._parquet_rows = [] if EXPORT_PARQUET else None
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(completed=exc_type is None)
+
+    def write(self, row_dict, ctx=None, errors_counter=None):
+        """Write one row; on exception, logs to ERROR_LOG and increments counter."""
+        try:
+            self._writer.writerow(row_dict)
+            record = {col: row_dict.get(col) for col in self.columns}
+            self._json.write(_json_line(record))
+            if self._parquet_rows is not None:
+                self._parquet_rows.append(record)
+            self.count += 1
+        except Exception as e:
+            ERROR_LOG.append({
+                "where": "StreamingExporter.write",
+                "context": ctx or "",
+                "detail": f"{type(e).__name__}: {e}"
+            })
+            if isinstance(errors_counter, dict):
+                errors_counter["count"] = errors_counter.get("count", 0) + 1
+
+    def close(self, completed=True):
+        """Finish the export; with completed=False the partial files are discarded instead."""
+        if self._csv.closed:
+            return
+        self._csv.close()
+        self._json.close()
+        for path in (self.csv_path, self.json_path):
+            if completed:
+                os.replace(path + ".part", path)
+            else:
+                os.remove(path + ".part")
+        if not completed:
+            self._parquet_rows = None
+            return
+        print(f"Saved: {self.csv_path} and {self.json_path}")
+        if self._parquet_rows is not None:
+            save_parquet(apply_dtypes(pd.DataFrame(self._parquet_rows, columns=self.columns)), self.filename)
+            self._parquet_rows = None
+
 
 def save_error_log():
     """Call once at end of main() to persist row-level issues."""
     if not ERROR_LOG:
-        pd.DataFrame([{"status": "no row-level errors recorded"}]).to_csv("errors.csv", index=False)
+        with open("errors.csv", "w", encoding="utf-8") as f:
+            f.write("status\nno row-level errors recorded\n")
         return
     # Normalize keys
     cols = sorted({k for d in ERROR_LOG for k in d.keys()})
@@ -223,7 +449,7 @@ def save_error_log():
 # ===================== EXPORTS (refactored; write CSV + JSON) =====================
 
 def export_liked_songs(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     for item in paginate(sp.current_user_saved_tracks, key="items", limit=50):
         track = item.get("track") or {}
         album = track.get("album") or {}
@@ -240,13 +466,13 @@ def export_liked_songs(sp: spotipy.Spotify) -> pd.DataFrame:
             "popularity": track.get("popularity"),
             "is_local": track.get("is_local", False),
         }
-        safe_row_append(rows, data, COLUMNS_ALL, ctx=f"liked:{track.get('id')}", errors_counter=ERR["liked"])
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("liked_songs"))
+        safe_row_append(cols, data, ctx=f"liked:{track.get('id')}", errors_counter=ERR["liked"])
+    df = frame_from_columns(cols)
+    save_csv_json(df, BASEPATHS["liked_songs"])
     return df
 
 def export_playlists(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     for pl in paginate(sp.current_user_playlists, key="items", limit=50):
         owner = pl.get("owner") or {}
         data = {
@@ -260,16 +486,20 @@ def export_playlists(sp: spotipy.Spotify) -> pd.DataFrame:
             "tracks_total": (pl.get("tracks") or {}).get("total"),
             "description": pl.get("description"),
         }
-        safe_row_append(rows, data, COLUMNS_ALL, ctx=f"playlist:{pl.get('id')}", errors_counter=ERR["playlists"])
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("playlists"))
+        safe_row_append(cols, data, ctx=f"playlist:{pl.get('id')}", errors_counter=ERR["playlists"])
+    df = frame_from_columns(cols)
+    save_csv_json(df, BASEPATHS["playlists"])
     return df
 
-def export_playlist_tracks(sp: spotipy.Spotify, playlists_df: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for _, pl in playlists_df.iterrows():
-        pl_id, pl_name = pl.get("playlist_id"), pl.get("playlist_name") or pl.get("name")
-        for it in paginate(sp.playlist_items, key="items", playlist_id=pl_id, limit=100, additional_types=("track",)):
+def export_playlist_tracks(sp: spotipy.Spotify, playlists_df: pd.DataFrame) -> int:
+    """Streams every playlist's tracks to disk as they arrive; returns the number of rows written."""
+    limit = 100
+
+    def _page(pl_id, offset):
+        return bounded_call(sp.playlist_items, playlist_id=pl_id, limit=limit, offset=offset, additional_types=("track",))
+
+    def _write_page(out, pl_id, pl_name, page):
+        for it in page.get("items", []):
             track = it.get("track") or {}
             album = track.get("album") or {}
             data = {
@@ -289,13 +519,45 @@ def export_playlist_tracks(sp: spotipy.Spotify, playlists_df: pd.DataFrame) -> p
                 "popularity": track.get("popularity"),
                 "type": track.get("type"),
             }
-            safe_row_append(rows, data, COLUMNS_ALL, ctx=f"pl:{pl_id}:{track.get('id')}", errors_counter=ERR["pl_tracks"])
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("playlist_tracks"))
-    return df
+            out.write(data, ctx=f"pl:{pl_id}:{track.get('id')}", errors_counter=ERR["pl_tracks"])
+
+    ids = playlists_df["playlist_id"].to_numpy()
+    names = playlists_df["playlist_name"].to_numpy()
+    totals = playlists_df["tracks_total"].to_numpy()
+
+    # playlists.csv already has each playlist's track count, so every page is known up front:
+    # (playlist_id, playlist_name, offset, is_last_page)
+    jobs = []
+    for pl_id, pl_name, total in zip(ids, names, totals):
+        total = 0 if pd.isna(total) else int(total)
+        offsets = range(0, max(total, 1), limit)
+        jobs.extend((pl_id, pl_name, offset, offset == offsets[-1]) for offset in offsets)
+
+    def _write_job(out, job, future):
+        pl_id, pl_name, offset, is_last = job
+        page = future.result()
+        _write_page(out, pl_id, pl_name, page)
+        # The playlist grew since it was listed: follow the remaining pages
+        while is_last and page.get("next"):
+            offset += limit
+            page = _page(pl_id, offset)
+            _write_page(out, pl_id, pl_name, page)
+
+    # Pages are fetched on the shared EXECUTOR and written in playlist/offset order. Only
+    # PAGES_AHEAD pages are submitted at a time, so finished pages waiting behind a slow one
+    # (e.g. sleeping on Retry-After) stay bounded instead of growing to the whole library.
+    with StreamingExporter(BASEPATHS["playlist_tracks"]) as out:
+        pending = deque()
+        for job in jobs:
+            pending.append((job, EXECUTOR.submit(_page, job[0], job[2])))
+            if len(pending) >= PAGES_AHEAD:
+                _write_job(out, *pending.popleft())
+        while pending:
+            _write_job(out, *pending.popleft())
+    return out.count
 
 def export_saved_albums(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     for item in paginate(sp.current_user_saved_albums, key="items", limit=50):
         album = item.get("album") or {}
         data = {
@@ -310,13 +572,13 @@ def export_saved_albums(sp: spotipy.Spotify) -> pd.DataFrame:
             "label": album.get("label"),
             "popularity": album.get("popularity"),
         }
-        safe_row_append(rows, data, COLUMNS_ALL, ctx=f"album:{album.get('id')}", errors_counter=ERR["saved_albums"])
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("saved_albums"))
+        safe_row_append(cols, data, ctx=f"album:{album.get('id')}", errors_counter=ERR["saved_albums"])
+    df = frame_from_columns(cols)
+    save_csv_json(df, BASEPATHS["saved_albums"])
     return df
 
 def export_followed_artists(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     after = None
     while True:
         page = sp.current_user_followed_artists(limit=50, after=after)
@@ -330,17 +592,17 @@ def export_followed_artists(sp: spotipy.Spotify) -> pd.DataFrame:
                 "followers": ((a.get("followers") or {}).get("total")),
                 "popularity": a.get("popularity"),
             }
-            safe_row_append(rows, data, COLUMNS_ALL, ctx=f"artist:{a.get('id')}", errors_counter=ERR["followed_artists"])
+            safe_row_append(cols, data, ctx=f"artist:{a.get('id')}", errors_counter=ERR["followed_artists"])
         next_url = (page.get("artists") or {}).get("next")
         after = ((page.get("artists") or {}).get("cursors") or {}).get("after")
         if not next_url:
             break
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("followed_artists"))
+    df = frame_from_columns(cols)
+    save_csv_json(df, BASEPATHS["followed_artists"])
     return df
 
 def export_saved_shows(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     try:
         for item in paginate(sp.current_user_saved_shows, key="items", limit=50):
             show = item.get("show") or {}
@@ -354,16 +616,16 @@ def export_saved_shows(sp: spotipy.Spotify) -> pd.DataFrame:
                 "languages": ", ".join(show.get("languages") or []),
                 "media_type": show.get("media_type"),
             }
-            safe_row_append(rows, data, COLUMNS_ALL, ctx=f"show:{show.get('id')}", errors_counter=ERR["saved_shows"])
+            safe_row_append(cols, data, ctx=f"show:{show.get('id')}", errors_counter=ERR["saved_shows"])
     except Exception:
         pass  # region/account without podcast API access
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
+    df = frame_from_columns(cols)
     if not df.empty:
-        save_csv_json(df, _basepath("saved_shows"))
+        save_csv_json(df, BASEPATHS["saved_shows"])
     return df
 
 def export_saved_episodes(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     try:
         for item in paginate(sp.current_user_saved_episodes, key="items", limit=50):
             ep = item.get("episode") or {}
@@ -379,26 +641,34 @@ def export_saved_episodes(sp: spotipy.Spotify) -> pd.DataFrame:
                 "show_name": show.get("name"),
                 "show_id": show.get("id"),
             }
-            safe_row_append(rows, data, COLUMNS_ALL, ctx=f"episode:{ep.get('id')}", errors_counter=ERR["saved_episodes"])
+            safe_row_append(cols, data, ctx=f"episode:{ep.get('id')}", errors_counter=ERR["saved_episodes"])
     except Exception:
         pass
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
+    df = frame_from_columns(cols)
     if not df.empty:
-        save_csv_json(df, _basepath("saved_episodes"))
+        save_csv_json(df, BASEPATHS["saved_episodes"])
     return df
 
 def export_top_items(sp: spotipy.Spotify) -> Dict[str, pd.DataFrame]:
     out = {}
     ranges = {"4w": "short_term", "6m": "medium_term", "all": "long_term"}
+    methods = {"artists": sp.current_user_top_artists, "tracks": sp.current_user_top_tracks}
+    offsets = range(0, 100, 50)
+
+    # The pages don't depend on each other, so request all of them at once
+    keys = [(kind, time_range, offset) for kind in methods for time_range in ranges.values() for offset in offsets]
+    fetched = EXECUTOR.map(lambda k: bounded_call(methods[k[0]], limit=50, offset=k[2], time_range=k[1]), keys)
+    pages = dict(zip(keys, fetched))
 
     for tag, time_range in ranges.items():
         # Top artists
-        arts = []
-        for offset in range(0, 100, 50):
-            page = sp.current_user_top_artists(limit=50, offset=offset, time_range=time_range)
+        arts, rank = {}, 0
+        for offset in offsets:
+            page = pages[("artists", time_range, offset)]
             for a in page.get("items", []):
+                rank += 1
                 data = {
-                    "rank": len(arts) + 1,
+                    "rank": rank,
                     "artist_id": a.get("id"),
                     "artist_uri": a.get("uri"),
                     "name": a.get("name"),
@@ -406,20 +676,21 @@ def export_top_items(sp: spotipy.Spotify) -> Dict[str, pd.DataFrame]:
                     "followers": ((a.get("followers") or {}).get("total")),
                     "popularity": a.get("popularity"),
                 }
-                safe_row_append(arts, data, COLUMNS_ALL, ctx=f"top_artist:{time_range}:{a.get('id')}", errors_counter=ERR["top"])
+                safe_row_append(arts, data, ctx=f"top_artist:{time_range}:{a.get('id')}", errors_counter=ERR["top"])
             if not page.get("next"): break
-        df_a = pd.DataFrame(arts, columns=COLUMNS_ALL)
-        save_csv_json(df_a, _basepath(f"top_artists_{tag}"))
+        df_a = frame_from_columns(arts)
+        save_csv_json(df_a, BASEPATHS[f"top_artists_{tag}"])
         out[f"top_artists_{tag}"] = df_a
 
         # Top tracks
-        trks = []
-        for offset in range(0, 100, 50):
-            page = sp.current_user_top_tracks(limit=50, offset=offset, time_range=time_range)
+        trks, rank = {}, 0
+        for offset in offsets:
+            page = pages[("tracks", time_range, offset)]
             for t in page.get("items", []):
+                rank += 1
                 album = t.get("album") or {}
                 data = {
-                    "rank": len(trks) + 1,
+                    "rank": rank,
                     "track_id": t.get("id"),
                     "track_uri": t.get("uri"),
                     "track_name": t.get("name"),
@@ -432,16 +703,16 @@ def export_top_items(sp: spotipy.Spotify) -> Dict[str, pd.DataFrame]:
                     "duration_ms": t.get("duration_ms"),
                     "explicit": t.get("explicit"),
                 }
-                safe_row_append(trks, data, COLUMNS_ALL, ctx=f"top_track:{time_range}:{t.get('id')}", errors_counter=ERR["top"])
+                safe_row_append(trks, data, ctx=f"top_track:{time_range}:{t.get('id')}", errors_counter=ERR["top"])
             if not page.get("next"): break
-        df_t = pd.DataFrame(trks, columns=COLUMNS_ALL)
-        save_csv_json(df_t, _basepath(f"top_tracks_{tag}"))
+        df_t = frame_from_columns(trks)
+        save_csv_json(df_t, BASEPATHS[f"top_tracks_{tag}"])
         out[f"top_tracks_{tag}"] = df_t
 
     return out
 
 def export_recently_played(sp: spotipy.Spotify) -> pd.DataFrame:
-    rows = []
+    cols = {}
     items = (sp.current_user_recently_played(limit=50).get("items", []))
     for it in items:
         t = it.get("track") or {}
@@ -458,56 +729,68 @@ def export_recently_played(sp: spotipy.Spotify) -> pd.DataFrame:
             "duration_ms": t.get("duration_ms"),
             "explicit": t.get("explicit"),
         }
-        safe_row_append(rows, data, COLUMNS_ALL, ctx=f"recent:{t.get('id')}", errors_counter=ERR["recent"])
-    df = pd.DataFrame(rows, columns=COLUMNS_ALL)
-    save_csv_json(df, _basepath("recently_played"))
+        safe_row_append(cols, data, ctx=f"recent:{t.get('id')}", errors_counter=ERR["recent"])
+    df = frame_from_columns(cols)
+    save_csv_json(df, BASEPATHS["recently_played"])
     return df
 
 
 
 # ========= MAIN =========
 def main():
+    if EXPORT_COMPRESS not in COMPRESS_SUFFIX:
+        print(f"ERROR: EXPORT_COMPRESS must be one of {', '.join(COMPRESS_SUFFIX)} (got {EXPORT_COMPRESS!r}).")
+        sys.exit(1)
+    if EXPORT_COMPRESS == "zstd" and zstandard is None:
+        print("ERROR: EXPORT_COMPRESS=zstd needs the zstandard package (pip install zstandard).")
+        sys.exit(1)
+    if EXPORT_PARQUET and pyarrow is None:
+        print("ERROR: EXPORT_PARQUET=1 needs the pyarrow package (pip install pyarrow).")
+        sys.exit(1)
 
-    sp = auth_client()
     try:
-        me = sp.me()
-        print("DEBUG user id:", me["id"], "email:", me.get("email"))
-    except Exception as e:
-        print("DEBUG token seems invalid:", e)
-        raise
-    print(me)
+        sp = auth_client()
+        try:
+            me = sp.me()
+            print("DEBUG user id:", me["id"], "email:", me.get("email"))
+        except Exception as e:
+            print("DEBUG token seems invalid:", e)
+            raise
+        print(me)
 
-    print(f"Hi, {me.get('display_name') or me.get('id')} — exporting your library…")
+        print(f"Hi, {me.get('display_name') or me.get('id')} — exporting your library…")
 
-    print("→ Liked Songs")
-    df1 = export_liked_songs(sp); print(f"   {len(df1)} rows → {OUT['liked_songs']}")
+        print("→ Liked Songs")
+        df1 = export_liked_songs(sp); print(f"   {len(df1)} rows → {OUT['liked_songs']}")
 
-    print("→ Playlists & Tracks")
-    dfp = export_playlists(sp); print(f"   {len(dfp)} playlists → {OUT['playlists']}")
-    if not dfp.empty:
-        dft = export_playlist_tracks(sp, dfp); print(f"   {len(dft)} rows → {OUT['playlist_tracks']}")
+        print("→ Playlists & Tracks")
+        dfp = export_playlists(sp); print(f"   {len(dfp)} playlists → {OUT['playlists']}")
+        if not dfp.empty:
+            n_tracks = export_playlist_tracks(sp, dfp); print(f"   {n_tracks} rows → {OUT['playlist_tracks']}")
 
-    print("→ Saved Albums")
-    dfa = export_saved_albums(sp); print(f"   {len(dfa)} rows → {OUT['saved_albums']}")
+        print("→ Saved Albums")
+        dfa = export_saved_albums(sp); print(f"   {len(dfa)} rows → {OUT['saved_albums']}")
 
-    print("→ Followed Artists")
-    dff = export_followed_artists(sp); print(f"   {len(dff)} rows → {OUT['followed_artists']}")
+        print("→ Followed Artists")
+        dff = export_followed_artists(sp); print(f"   {len(dff)} rows → {OUT['followed_artists']}")
 
-    print("→ Saved Shows / Episodes (if available)")
-    dfs = export_saved_shows(sp); print(f"   {0 if dfs is None else len(dfs)} rows → {OUT['saved_shows'] if dfs is not None and not dfs.empty else '(skipped)'}")
-    dfe = export_saved_episodes(sp); print(f"   {0 if dfe is None else len(dfe)} rows → {OUT['saved_episodes'] if dfe is not None and not dfe.empty else '(skipped)'}")
+        print("→ Saved Shows / Episodes (if available)")
+        dfs = export_saved_shows(sp); print(f"   {0 if dfs is None else len(dfs)} rows → {OUT['saved_shows'] if dfs is not None and not dfs.empty else '(skipped)'}")
+        dfe = export_saved_episodes(sp); print(f"   {0 if dfe is None else len(dfe)} rows → {OUT['saved_episodes'] if dfe is not None and not dfe.empty else '(skipped)'}")
 
-    print("→ Top Artists/Tracks (4w, 6m, all)")
-    _ = export_top_items(sp)
-    print(f"   wrote: top_* CSVs")
+        print("→ Top Artists/Tracks (4w, 6m, all)")
+        _ = export_top_items(sp)
+        print(f"   wrote: top_* CSVs")
 
-    # print("→ Recently Played")
-    # dfr = export_recently_played(sp); print(f"   {len(dfr)} rows → {OUT['recently_played']}")
+        # print("→ Recently Played")
+        # dfr = export_recently_played(sp); print(f"   {len(dfr)} rows → {OUT['recently_played']}")
 
-    print("Done ✨  All CSVs are in the current folder.")
-    print("------------------------------------------------")
-    save_error_log()
-    print("Error counts:", {k: v["count"] for k, v in ERR.items()})
+        print("Done ✨  All CSVs are in the current folder.")
+        print("------------------------------------------------")
+        save_error_log()
+        print("Error counts:", {k: v["count"] for k, v in ERR.items()})
+    finally:
+        EXECUTOR.shutdown(cancel_futures=True)
 
 
 
@@ -517,7 +800,7 @@ if __name__ == "__main__":
     except spotipy.SpotifyException as e:
         print(f"Spotify API error: {e}")
         if getattr(e, 'http_status', None) == 429:
-            print("Hit a rate limit. Try again in a minute.")
+            print("Still rate-limited after retrying. Try again in a minute.")
         sys.exit(1)
     except KeyboardInterrupt:
         print("\nCancelled by user.")